@@ -1,6 +1,6 @@
 from tensorflow.keras.layers import Conv2D, Dropout, LeakyReLU
 from tensorflow.keras.layers import BatchNormalization, Conv2DTranspose
-from tensorflow.keras.layers import Dense, Reshape, Flatten, MaxPool2D
+from tensorflow.keras.layers import Dense, Reshape, MaxPool2D, GlobalAveragePooling2D
 import cv2
 import imageio
 import os
@@ -15,6 +15,7 @@ import datetime
 from tqdm.auto import tqdm
 
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+os.environ.setdefault("TF_CUDNN_USE_AUTOTUNE", "1")
 
 ### Silence Imageio warnings
 def silence_imageio_warning(*args, **kwargs):
@@ -27,6 +28,18 @@ imageio.core.util._precision_warn = silence_imageio_warning
 __all__ = ["ConvolutionalAutoencoder"]
 
 
+def _conv_kwargs(config):
+
+    # Layer arguments shared by every convolution of the encoder and decoder
+    return dict(
+        kernel_size=config["kernel_size"],
+        padding="same",
+        data_format="channels_last",
+        kernel_initializer=config["kernel_initializer"],
+        kernel_regularizer=config["kernel_regularizer"],
+    )
+
+
 class ConvolutionalAutoencoder:
 
     r"""Convolutional Autoencoder model
@@ -92,14 +105,28 @@ class ConvolutionalAutoencoder:
 
         self.image_size = train_data.shape[1:]
 
-        train_data = train_data / 255
         train_ds = (
-            tf.data.Dataset.from_tensor_slices(train_data).shuffle(10000).batch(batch_size)
+            tf.data.Dataset.from_tensor_slices(train_data)
+            .map(
+                lambda x: tf.cast(x, tf.float32) / 255.0,
+                num_parallel_calls=tf.data.experimental.AUTOTUNE,
+            )
+            .cache()
+            .shuffle(train_data.shape[0], reshuffle_each_iteration=True)
+            .batch(batch_size, drop_remainder=True)
+            .prefetch(tf.data.experimental.AUTOTUNE)
         )
 
-        test_data = test_data / 255
         test_ds = (
-            tf.data.Dataset.from_tensor_slices(test_data).shuffle(10000).batch(batch_size)
+            tf.data.Dataset.from_tensor_slices(test_data)
+            .map(
+                lambda x: tf.cast(x, tf.float32) / 255.0,
+                num_parallel_calls=tf.data.experimental.AUTOTUNE,
+            )
+            .cache()
+            .shuffle(test_data.shape[0], reshuffle_each_iteration=True)
+            .batch(batch_size)
+            .prefetch(tf.data.experimental.AUTOTUNE)
         )
 
         return train_ds, test_ds
@@ -119,14 +146,7 @@ class ConvolutionalAutoencoder:
 
         assert data is not None, "Data not provided"
 
-        sample_images = []
-        data = data.unbatch()
-        for img in data.take(n_samples):
-
-            img = img.numpy()
-            sample_images.append(img)
-
-        sample_images = np.array(sample_images)
+        sample_images = next(iter(data.unbatch().batch(n_samples).take(1))).numpy()
 
         if save_dir is None:
             return sample_images
@@ -141,39 +161,25 @@ class ConvolutionalAutoencoder:
         encoder_layers = len(enc_channels)
         interm_dim = config["interm_dim"]
         activation = config["activation"]
-        kernel_initializer = config["kernel_initializer"]
-        kernel_regularizer = config["kernel_regularizer"]
-        kernel_size = config["kernel_size"]
+        conv_kwargs = _conv_kwargs(config)
 
         model = tf.keras.Sequential()
 
         model.add(
             Conv2D(
                 enc_channels[0] // 2,
-                kernel_size=kernel_size,
-                padding="same",
                 activation=activation,
-                kernel_initializer=kernel_initializer,
-                kernel_regularizer=kernel_regularizer,
                 input_shape=self.image_size,
+                **conv_kwargs,
             )
         )
-        model.add(MaxPool2D())
+        model.add(MaxPool2D(data_format="channels_last"))
 
         for i in range(encoder_layers):
-            model.add(
-                Conv2D(
-                    enc_channels[i],
-                    kernel_size=kernel_size,
-                    padding="same",
-                    activation=activation,
-                    kernel_initializer=kernel_initializer,
-                    kernel_regularizer=kernel_regularizer,
-                )
-            )
-            model.add(MaxPool2D())
+            model.add(Conv2D(enc_channels[i], activation=activation, **conv_kwargs))
+            model.add(MaxPool2D(data_format="channels_last"))
 
-        model.add(Flatten())
+        model.add(GlobalAveragePooling2D(data_format="channels_last"))
         model.add(Dense(interm_dim, activation="sigmoid"))
 
         return model
@@ -187,6 +193,7 @@ class ConvolutionalAutoencoder:
         kernel_initializer = config["kernel_initializer"]
         kernel_regularizer = config["kernel_regularizer"]
         kernel_size = config["kernel_size"]
+        conv_kwargs = _conv_kwargs(config)
 
         model = tf.keras.Sequential()
 
@@ -208,40 +215,13 @@ class ConvolutionalAutoencoder:
 
         k = 0
         for _ in range(decoder_layers // 2):
-            model.add(
-                Conv2DTranspose(
-                    dec_channels[k],
-                    kernel_size=kernel_size,
-                    strides=(1, 1),
-                    padding="same",
-                    kernel_initializer=kernel_initializer,
-                    kernel_regularizer=kernel_regularizer,
-                )
-            )
+            model.add(Conv2DTranspose(dec_channels[k], strides=(1, 1), **conv_kwargs))
             k += 1
 
-        model.add(
-            Conv2DTranspose(
-                dec_channels[k],
-                kernel_size=kernel_size,
-                strides=(2, 2),
-                padding="same",
-                kernel_initializer=kernel_initializer,
-                kernel_regularizer=kernel_regularizer,
-            )
-        )
+        model.add(Conv2DTranspose(dec_channels[k], strides=(2, 2), **conv_kwargs))
 
         for _ in range(decoder_layers // 2):
-            model.add(
-                Conv2DTranspose(
-                    dec_channels[k],
-                    kernel_size=kernel_size,
-                    strides=(1, 1),
-                    padding="same",
-                    kernel_initializer=kernel_initializer,
-                    kernel_regularizer=kernel_regularizer,
-                )
-            )
+            model.add(Conv2DTranspose(dec_channels[k], strides=(1, 1), **conv_kwargs))
             k += 1
 
         model.add(
@@ -250,7 +230,9 @@ class ConvolutionalAutoencoder:
                 kernel_size=kernel_size,
                 strides=(2, 2),
                 padding="same",
+                data_format="channels_last",
                 activation="tanh",
+                dtype="float32",
             )
         )
 
@@ -258,8 +240,17 @@ class ConvolutionalAutoencoder:
 
     def __load_model(self):
 
-        self.model.add(self.encoder(self.config))
-        self.model.add(self.decoder(self.config))
+        # Run convolutions in float16 on GPUs with Tensor Cores, variables stay in float32.
+        # The previous policy is restored once the layers are built
+        policy = tf.keras.mixed_precision.global_policy()
+        if tf.config.list_physical_devices("GPU"):
+            tf.keras.mixed_precision.set_global_policy("mixed_float16")
+
+        try:
+            self.model.add(self.encoder(self.config))
+            self.model.add(self.decoder(self.config))
+        finally:
+            tf.keras.mixed_precision.set_global_policy(policy)
 
     def fit(
         self,
@@ -270,6 +261,7 @@ class ConvolutionalAutoencoder:
         learning_rate=0.001,
         tensorboard=False,
         save_model=None,
+        use_xla=True,
     ):
 
         r"""Function to train the model
@@ -283,6 +275,7 @@ class ConvolutionalAutoencoder:
             tensorboard (bool, optional): if true, writes loss values to ``logs/gradient_tape`` directory
                 which aids visualization. Defaults to ``False``
             save_model (str, optional): Directory to save the trained model. Defaults to ``None``
+            use_xla (bool, optional): if true, compiles the training step with XLA. Defaults to ``True``
         """
 
         assert train_ds is not None, "Initialize training data through train_ds parameter"
@@ -292,12 +285,29 @@ class ConvolutionalAutoencoder:
         kwargs = {}
         kwargs["learning_rate"] = learning_rate
         optimizer = getattr(tf.keras.optimizers, optimizer)(**kwargs)
+        optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
 
         if tensorboard:
             current_time = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
             train_log_dir = "logs/gradient_tape/" + current_time + "/train"
             train_summary_writer = tf.summary.create_file_writer(train_log_dir)
 
+        # XLA fuses the conv, bias and activation ops of the model into fewer kernels, a
+        # single static input shape lets cuDNN reuse its autotuned algorithms every step
+        @tf.function(jit_compile=use_xla, input_signature=[train_ds.element_spec])
+        def train_step(data):
+
+            with tf.GradientTape() as tape:
+                recon_data = self.model(data, training=True)
+                loss = mse_loss(data, recon_data)
+                scaled_loss = optimizer.get_scaled_loss(loss)
+
+            scaled_gradients = tape.gradient(scaled_loss, self.model.trainable_variables)
+            gradients = optimizer.get_unscaled_gradients(scaled_gradients)
+            optimizer.apply_gradients(zip(gradients, self.model.trainable_variables))
+
+            return loss
+
         steps = 0
         train_loss = tf.keras.metrics.Mean()
 
@@ -313,12 +323,7 @@ class ConvolutionalAutoencoder:
             pbar = tqdm(total=total, desc="Epoch - " + str(epoch + 1))
             for data in train_ds:
 
-                with tf.GradientTape() as tape:
-                    recon_data = self.model(data)
-                    loss = mse_loss(data, recon_data)
-
-                gradients = tape.gradient(loss, self.model.trainable_variables)
-                optimizer.apply_gradients(zip(gradients, self.model.trainable_variables))
+                loss = train_step(data)
 
                 train_loss(loss)
 
@@ -1,27 +1,18 @@
-import cv2
 import os
-from tensorflow.keras.layers import Dropout, BatchNormalization
-from tensorflow.keras.layers import Lambda, Dense, Reshape, Input
+from tensorflow.keras.layers import Dense, Input
 from tensorflow.keras import Model
-import imageio
 import numpy as np
 from ..datasets.load_cifar10 import load_cifar10_AE
 from ..datasets.load_mnist import load_mnist_AE
 from ..datasets.load_custom_data import load_custom_data_AE
 from ..losses.mse_loss import mse_loss
+from ..utils.save_images import save_images
 import tensorflow as tf
 import datetime
 from tqdm.auto import tqdm
 
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 
-### Silence Imageio warnings
-def silence_imageio_warning(*args, **kwargs):
-    pass
-
-
-imageio.core.util._precision_warn = silence_imageio_warning
-
 """
 References: 
 -> https://arxiv.org/abs/1312.6114
@@ -57,7 +48,9 @@ class VAE:
     ):
 
         self.model = None
+        self._infer_step = None
         self.image_size = None
+        self.flat_dim = None
         self.config = locals()
 
     def load_data(
@@ -95,25 +88,28 @@ class VAE:
             train_data, test_data = load_custom_data_AE(data_dir, img_shape)
 
         self.image_size = train_data.shape[1:]
+        self.flat_dim = int(np.prod(self.image_size))
+
+        # Scaling and flattening run once per image in the pipeline, ahead of the cache
+        def preprocess(x):
+            return tf.reshape(tf.cast(x, tf.float32) / 255.0, (self.flat_dim,))
 
-        train_data = (
-            train_data.reshape(
-                (-1, self.image_size[0] * self.image_size[1] * self.image_size[2])
-            )
-            / 255
-        )
         train_ds = (
-            tf.data.Dataset.from_tensor_slices(train_data).shuffle(10000).batch(batch_size)
+            tf.data.Dataset.from_tensor_slices(train_data)
+            .map(preprocess, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+            .cache()
+            .shuffle(train_data.shape[0], reshuffle_each_iteration=True)
+            .batch(batch_size, drop_remainder=True)
+            .prefetch(tf.data.experimental.AUTOTUNE)
         )
 
-        test_data = (
-            test_data.reshape(
-                (-1, self.image_size[0] * self.image_size[1] * self.image_size[2])
-            )
-            / 255
-        )
         test_ds = (
-            tf.data.Dataset.from_tensor_slices(test_data).shuffle(10000).batch(batch_size)
+            tf.data.Dataset.from_tensor_slices(test_data)
+            .map(preprocess, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+            .cache()
+            .shuffle(test_data.shape[0], reshuffle_each_iteration=True)
+            .batch(batch_size)
+            .prefetch(tf.data.experimental.AUTOTUNE)
         )
 
         return train_ds, test_ds
@@ -133,34 +129,16 @@ class VAE:
 
         assert data is not None, "Data not provided"
 
-        sample_images = []
-        data = data.unbatch()
-        for img in data.take(n_samples):
-
-            img = img.numpy()
-            img = img.reshape((self.image_size[0], self.image_size[1], self.image_size[2]))
-            sample_images.append(img)
-
-        sample_images = np.array(sample_images)
+        sample_images = next(iter(data.unbatch().batch(n_samples).take(1))).numpy()
+        sample_images = sample_images.reshape(
+            (-1, self.image_size[0], self.image_size[1], self.image_size[2])
+        )
 
         if save_dir is None:
             return sample_images
 
         assert os.path.exists(save_dir), "Directory does not exist"
-        for i, sample in enumerate(sample_images):
-            imageio.imwrite(os.path.join(save_dir, "sample_" + str(i) + ".jpg"), sample)
-
-    def sampling(self, distribution):
-
-        z_mean = distribution[0]
-        z_var = distribution[1]
-
-        batch = tf.keras.backend.shape(z_mean)[0]
-        dim = tf.keras.backend.int_shape(z_mean)[1]
-
-        epsilon = tf.keras.backend.random_normal((batch, dim))
-
-        return z_mean + tf.keras.backend.exp(0.5 * z_var) * epsilon
+        save_images(sample_images, save_dir)
 
     """
     encoder and decoder layers for custom dataset can be reimplemented by inherting this class(vae)
@@ -178,7 +156,7 @@ class VAE:
         kernel_initializer = config["kernel_initializer"]
         kernel_regularizer = config["kernel_regularizer"]
 
-        org_inputs = Input(shape=self.image_size[0] * self.image_size[1] * self.image_size[2])
+        org_inputs = Input(shape=(self.flat_dim,))
         x = Dense(
             enc_units[0] * 2,
             activation=activation,
@@ -202,13 +180,14 @@ class VAE:
         )(x)
 
         z_mean = Dense(latent_dim)(x)
-        z_var = Dense(latent_dim)(x)
+        z_log_var = Dense(latent_dim)(x)
 
         # Sampling from intermediate dimensiont to get a probability density
-        z = Lambda(self.sampling, output_shape=(latent_dim,))([z_mean, z_var])
+        epsilon = tf.random.normal(tf.shape(z_mean), dtype=z_mean.dtype)
+        z = z_mean + tf.math.exp(0.5 * z_log_var) * epsilon
 
         # Encoder model
-        enc_model = Model(org_inputs, [z_mean, z_var])
+        enc_model = Model(org_inputs, [z_mean, z_log_var])
 
         latent_inputs = Input(shape=(latent_dim,))
         outputs = Dense(
@@ -226,20 +205,21 @@ class VAE:
                 kernel_regularizer=kernel_regularizer,
             )(outputs)
 
+        # float32 output keeps the sigmoid and loss stable under mixed precision
         final_outputs = Dense(
-            self.image_size[0] * self.image_size[1] * self.image_size[2], activation="sigmoid"
+            self.flat_dim,
+            activation="sigmoid",
+            dtype="float32",
         )(outputs)
 
         # Decoder model
         dec_model = Model(latent_inputs, final_outputs)
 
         out = dec_model(z)
-        model = Model(org_inputs, out)
 
-        kl_loss = -0.5 * tf.math.reduce_mean(
-            z_var - tf.math.square(z_mean) - tf.math.exp(z_var) + 1
-        )
-        model.add_loss(kl_loss)
+        # The distribution parameters are returned along with the reconstruction so the
+        # KL divergence is computed in the same training step as the reconstruction loss
+        model = Model(org_inputs, [out, z_mean, z_log_var])
 
         return model
 
@@ -249,7 +229,28 @@ class VAE:
 
     def __load_model(self):
 
-        self.model = self.vae(self.config)
+        # Run matmuls in float16 on GPUs with Tensor Cores, variables stay in float32.
+        # The previous policy is restored once the layers are built
+        policy = tf.keras.mixed_precision.global_policy()
+        if tf.config.list_physical_devices("GPU"):
+            tf.keras.mixed_precision.set_global_policy("mixed_float16")
+
+        try:
+            self.model = self.vae(self.config)
+        finally:
+            tf.keras.mixed_precision.set_global_policy(policy)
+
+        # Traced once per model, the unknown batch dimension also covers the short
+        # last batch of the test set
+        self._infer_step = tf.function(
+            self._infer,
+            input_signature=[tf.TensorSpec([None, self.flat_dim], tf.float32)],
+        )
+
+    def _infer(self, data):
+
+        gen_sample, _, _ = self.model(data, training=False)
+        return gen_sample
 
     def fit(
         self,
@@ -278,19 +279,44 @@ class VAE:
         assert train_ds is not None, "Initialize training data through train_ds parameter"
 
         self.__load_model()
+        trainable_variables = self.model.trainable_variables
 
         kwargs = {}
         kwargs["learning_rate"] = learning_rate
         optimizer = getattr(tf.keras.optimizers, optimizer)(**kwargs)
+        optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
 
         if tensorboard:
             current_time = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
             train_log_dir = "logs/gradient_tape/" + current_time + "/train"
             train_summary_writer = tf.summary.create_file_writer(train_log_dir)
 
-        steps = 0
         train_loss = tf.keras.metrics.Mean()
 
+        # A fixed input signature traces the step once for the static batch shape
+        @tf.function(input_signature=[train_ds.element_spec])
+        def train_step(data):
+
+            with tf.GradientTape() as tape:
+                data_recon, z_mean, z_log_var = self.model(data, training=True)
+                z_mean = tf.cast(z_mean, tf.float32)
+                z_log_var = tf.cast(z_log_var, tf.float32)
+                kl_loss = -0.5 * tf.math.reduce_mean(
+                    z_log_var - tf.math.square(z_mean) - tf.math.exp(z_log_var) + 1
+                )
+                loss = mse_loss(data, data_recon) + kl_loss + sum(self.model.losses)
+                scaled_loss = optimizer.get_scaled_loss(loss)
+
+            scaled_gradients = tape.gradient(scaled_loss, trainable_variables)
+            gradients = optimizer.get_unscaled_gradients(scaled_gradients)
+            optimizer.apply_gradients(zip(gradients, trainable_variables))
+
+            train_loss.update_state(loss)
+
+            if tensorboard:
+                with train_summary_writer.as_default():
+                    tf.summary.scalar("loss", loss, step=optimizer.iterations)
+
         try:
             total = tf.data.experimental.cardinality(train_ds).numpy()
         except:
@@ -298,32 +324,20 @@ class VAE:
 
         for epoch in range(epochs):
 
-            train_loss.reset_states()
-
             pbar = tqdm(total=total, desc="Epoch - " + str(epoch + 1))
             for data in train_ds:
 
-                with tf.GradientTape() as tape:
-                    data_recon = self.model(data)
-                    loss = mse_loss(data, data_recon)
-
-                gradients = tape.gradient(loss, self.model.trainable_variables)
-                optimizer.apply_gradients(zip(gradients, self.model.trainable_variables))
-
-                train_loss(loss)
+                train_step(data)
 
-                steps += 1
                 pbar.update(1)
 
-                if tensorboard:
-                    with train_summary_writer.as_default():
-                        tf.summary.scalar("loss", loss.numpy(), step=steps)
-
             pbar.close()
             del pbar
 
             if verbose == 1:
-                print("Epoch:", epoch + 1, "reconstruction loss:", train_loss.result().numpy())
+                print("Epoch:", epoch + 1, "total loss:", train_loss.result().numpy())
+
+            train_loss.reset_states()
 
         if save_model is not None:
 
@@ -347,21 +361,15 @@ class VAE:
 
         assert test_ds is not None, "Enter input test dataset"
 
-        generated_samples = np.array([])
-        for i, data in enumerate(test_ds):
-            gen_sample = self.model(data, training=False)
-            gen_sample = gen_sample.numpy()
-            if i == 0:
-                generated_samples = gen_sample
-            else:
-                generated_samples = np.concatenate((generated_samples, gen_sample), 0)
+        generated_samples = []
+        for data in test_ds:
+            generated_samples.append(self._infer_step(data).numpy())
 
-        generated_samples = generated_samples.reshape(
+        generated_samples = np.concatenate(generated_samples, 0).reshape(
             (-1, self.image_size[0], self.image_size[1], self.image_size[2])
         )
         if save_dir is None:
             return generated_samples
 
         assert os.path.exists(save_dir), "Directory does not exist"
-        for i, sample in enumerate(generated_samples):
-            imageio.imwrite(os.path.join(save_dir, "sample_" + str(i) + ".jpg"), sample)
+        save_images(generated_samples, save_dir)
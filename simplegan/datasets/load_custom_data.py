@@ -11,7 +11,12 @@ Dataset is loaded from tensorflow keras datasets
 Function load_data returns a numpy array of shape (-1, 64, 64, 3) by default
 """
 
-__all__ = ["load_custom_data", "load_custom_data_AE", "load_custom_data_with_labels"]
+__all__ = [
+    "load_custom_data",
+    "load_custom_data_pipeline",
+    "load_custom_data_AE",
+    "load_custom_data_with_labels",
+]
 
 
 def load_custom_data(datadir=None, img_shape=(64, 64)):
@@ -52,6 +57,58 @@ def load_custom_data(datadir=None, img_shape=(64, 64)):
     return train_data
 
 
+def load_custom_data_pipeline(datadir=None, img_shape=(64, 64)):
+
+    r"""Builds a tensorflow dataset that reads and resizes images from specified directory in parallel - used in GANs
+
+    Args:
+        datadir (str): directory to load data from. Defaults to ``None``
+        img_shape (int, tuple, optional): shape of the image to be returned. Defaults to ``(64, 64)``
+
+    Return:
+        a tensorflow dataset of float32 RGB images of shape according to img_shape parameter
+    """
+
+    error_message = "Enter a valid directory \n Directory structure: \n {} \n {} -*jpg".format(
+        datadir, " " * 2
+    )
+    assert datadir is not None, error_message
+    assert len(img_shape) == 2 and isinstance(
+        img_shape, tuple
+    ), "img_shape must be a tuple of size 2"
+
+    extensions = (".jpg", ".jpeg", ".png", ".bmp", ".gif")
+    files = [
+        file
+        for file in glob.glob(os.path.join(datadir, "*"))
+        if os.path.splitext(file)[1].lower() in extensions
+    ]
+
+    assert len(files) > 0, "No images to load from directory"
+
+    def read_image(file):
+        image = tf.io.decode_image(
+            tf.io.read_file(file), channels=3, expand_animations=False
+        )
+        return tf.data.Dataset.from_tensors(image)
+
+    train_ds = (
+        tf.data.Dataset.from_tensor_slices(files)
+        .interleave(
+            read_image,
+            num_parallel_calls=tf.data.experimental.AUTOTUNE,
+            deterministic=False,
+        )
+        .map(
+            lambda x: tf.image.resize(x, img_shape, method="area"),
+            num_parallel_calls=tf.data.experimental.AUTOTUNE,
+        )
+        .apply(tf.data.experimental.assert_cardinality(len(files)))
+    )
+
+    return train_ds
+
+
 def load_custom_data_AE(datadir=None, img_shape=(64, 64)):
 
     r"""Loads train and test data from a specified directory and returns a numpy array of train and test images - used in Autoencoder
@@ -1,28 +1,24 @@
 import os
 from tensorflow.keras.layers import Conv2D, Dropout, BatchNormalization, LeakyReLU
-from tensorflow.keras.layers import Conv2DTranspose, Dense, Reshape, Flatten
+from tensorflow.keras.layers import Conv2DTranspose, Dense, Reshape, Flatten, Input
+from tensorflow.keras.layers import InputLayer
 from tensorflow.keras import Model
 from ..datasets.load_cifar10 import load_cifar10
 from ..datasets.load_mnist import load_mnist
-from ..datasets.load_custom_data import load_custom_data
+from ..datasets.load_custom_data import load_custom_data_pipeline
 from ..datasets.load_cifar100 import load_cifar100
 from ..datasets.load_lsun import load_lsun
 from ..losses.minmax_loss import gan_discriminator_loss, gan_generator_loss
-import cv2
+from ..utils.save_images import save_images
 import numpy as np
 import datetime
+import itertools
 import tensorflow as tf
-import imageio
 from tqdm.auto import tqdm
 
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
-
-### Silence Imageio warnings
-def silence_imageio_warning(*args, **kwargs):
-    pass
-
-
-imageio.core.util._precision_warn = silence_imageio_warning
+os.environ.setdefault("TF_CUDNN_USE_AUTOTUNE", "1")
+os.environ.setdefault("TF_ENABLE_CUBLAS_TENSOR_OP_MATH_FP32", "1")
 
 """
 References: 
@@ -32,6 +28,68 @@ References:
 __all__ = ["DCGAN"]
 
 
+def _is_single_path(model):
+
+    # Folding rebuilds the layers as a plain chain, which is only valid when every
+    # layer is called once, on the output of the layer before it
+    if len(model.inputs) != 1 or len(model.outputs) != 1:
+        return False
+    if not isinstance(model.layers[0], InputLayer):
+        return False
+
+    for previous, layer in zip(model.layers, model.layers[1:]):
+        if len(layer._inbound_nodes) != 1:
+            return False
+        inbound_layers = tf.nest.flatten(layer._inbound_nodes[0].inbound_layers)
+        if len(inbound_layers) != 1 or inbound_layers[0] is not previous:
+            return False
+
+    return model.layers[-1].output is model.outputs[0]
+
+
+def _fold_batch_norm(model):
+
+    # Folds every Conv2DTranspose -> BatchNormalization pair of a trained single
+    # path model into one biased Conv2DTranspose, inference results are unchanged
+    model_layers = model.layers[1:]
+    layers, weights = [], []
+    i = 0
+    while i < len(model_layers):
+        layer = model_layers[i]
+        following = model_layers[i + 1] if i + 1 < len(model_layers) else None
+        config = layer.get_config()
+
+        if (
+            isinstance(layer, Conv2DTranspose)
+            and isinstance(following, BatchNormalization)
+            and config["activation"] == "linear"
+        ):
+            gamma, beta, moving_mean, moving_variance = following.get_weights()
+            scale = gamma / np.sqrt(moving_variance + following.epsilon)
+            kernel = layer.get_weights()[0]
+            bias = layer.get_weights()[1] if layer.use_bias else 0.0
+
+            config["use_bias"] = True
+            layers.append(Conv2DTranspose.from_config(config))
+            # kernel is laid out as (height, width, out_channels, in_channels)
+            weights.append(
+                [kernel * scale[:, np.newaxis], (bias - moving_mean) * scale + beta]
+            )
+            i += 2
+        else:
+            layers.append(layer.__class__.from_config(config))
+            weights.append(layer.get_weights())
+            i += 1
+
+    inputs = Input(shape=model.input_shape[1:])
+    x = inputs
+    for layer, layer_weights in zip(layers, weights):
+        x = layer(x)
+        layer.set_weights(layer_weights)
+
+    return Model(inputs, x)
+
+
 class DCGAN:
 
     r"""`DCGAN <https://arxiv.org/abs/1511.06434>`_ model
@@ -67,6 +125,16 @@ class DCGAN:
         self.noise_dim = noise_dim
         self.gen_model = None
         self.disc_model = None
+        self._folded_gen_model = None
+        self._gen_optimizer = None
+        self._disc_optimizer = None
+        self._gen_optimizer_config = None
+        self._disc_optimizer_config = None
+        self._strategy = None
+        self._rng = None
+        self._steps_per_epoch = None
+        self._n_disc_steps = 1
+        self._n_gen_steps = 1
         self.config = locals()
 
     def load_data(
@@ -88,40 +156,52 @@ class DCGAN:
             use_cifar10 (bool, optional): use the CIFAR10 dataset to train the model. Defaults to ``False``
             use_cifar100 (bool, optional): use the CIFAR100 dataset to train the model. Defaults to ``False``
             use_lsun (bool, optional): use the LSUN dataset to train the model. Defaults to ``False``
-            batch_size (int, optional): mini batch size for training the model. Defaults to ``32``
+            batch_size (int, optional): mini batch size per device for training the model. Defaults to ``32``
             img_shape (int, tuple, optional): shape of the image when loading data from custom directory. Defaults to ``(64, 64)``
 
         Return:
-            a tensorflow dataset objects representing the training datset
+            a repeating tensorflow dataset object representing the training datset
         """
 
         if use_mnist:
 
-            train_data = load_mnist()
+            train_ds = tf.data.Dataset.from_tensor_slices(load_mnist())
 
         elif use_cifar10:
 
-            train_data = load_cifar10()
+            train_ds = tf.data.Dataset.from_tensor_slices(load_cifar10())
 
         elif use_cifar100:
 
-            train_data = load_cifar100()
+            train_ds = tf.data.Dataset.from_tensor_slices(load_cifar100())
 
         elif use_lsun:
 
-            train_data = load_lsun()
+            train_ds = tf.data.Dataset.from_tensor_slices(load_lsun())
 
         else:
 
-            train_data = load_custom_data(data_dir, img_shape)
+            train_ds = load_custom_data_pipeline(data_dir, img_shape)
 
-        self.image_size = train_data.shape[1:]
+        self.image_size = tuple(train_ds.element_spec.shape)
+        batch_size = batch_size * self._num_replicas()
+        n_images = tf.data.experimental.cardinality(train_ds).numpy()
+        # Datasets smaller than one global batch are trained on as a single partial batch
+        drop_remainder = n_images >= batch_size
+        self._steps_per_epoch = max(1, n_images // batch_size)
 
-        train_data = (train_data - 127.5) / 127.5
+        # Images are normalized and cached once, then reshuffled every epoch. Repeated
+        # so a single iterator serves every epoch in fit
         train_ds = (
-            tf.data.Dataset.from_tensor_slices(train_data)
-            .shuffle(10000)
-            .batch(batch_size)
+            train_ds.map(
+                lambda x: (tf.cast(x, tf.float32) - 127.5) / 127.5,
+                num_parallel_calls=tf.data.experimental.AUTOTUNE,
+            )
+            .cache()
+            .shuffle(10000, reshuffle_each_iteration=True)
+            .batch(batch_size, drop_remainder=drop_remainder)
+            .repeat()
+            .prefetch(tf.data.experimental.AUTOTUNE)
         )
 
         return train_ds
@@ -141,21 +221,15 @@ class DCGAN:
 
         assert data is not None, "Data not provided"
 
-        sample_images = []
-        data = data.unbatch()
-        for img in data.take(n_samples):
-
-            img = img.numpy()
-            sample_images.append(img)
-
-        sample_images = np.array(sample_images)
+        sample_images = next(
+            iter(data.unbatch().take(n_samples).batch(n_samples))
+        ).numpy()
 
         if save_dir is None:
             return sample_images
 
         assert os.path.exists(save_dir), "Directory does not exist"
-        for i, sample in enumerate(sample_images):
-            imageio.imwrite(os.path.join(save_dir, "sample_" + str(i) + ".jpg"), sample)
+        save_images(sample_images, save_dir, value_range=(-1.0, 1.0))
 
     def generator(self):
 
@@ -173,89 +247,83 @@ class DCGAN:
         kernel_regularizer = self.config["kernel_regularizer"]
         kernel_size = self.config["kernel_size"]
 
-        model = tf.keras.Sequential()
-        model.add(
-            Dense(
-                (self.image_size[0] // 4)
-                * (self.image_size[1] // 4)
-                * (gen_channels[0] * 2),
-                activation=activation,
-                kernel_initializer=kernel_initializer,
-                kernel_regularizer=kernel_regularizer,
-                input_dim=noise_dim,
+        z = Input(shape=(noise_dim,))
+
+        x = Dense(
+            (self.image_size[0] // 4)
+            * (self.image_size[1] // 4)
+            * (gen_channels[0] * 2),
+            activation=activation,
+            kernel_initializer=kernel_initializer,
+            kernel_regularizer=kernel_regularizer,
+        )(z)
+        x = BatchNormalization()(x)
+        x = LeakyReLU()(x)
+
+        x = Reshape(
+            (
+                (self.image_size[0] // 4),
+                (self.image_size[1] // 4),
+                (gen_channels[0] * 2),
             )
-        )
-        model.add(BatchNormalization())
-        model.add(LeakyReLU())
-
-        model.add(
-            Reshape(
-                (
-                    (self.image_size[0] // 4),
-                    (self.image_size[1] // 4),
-                    (gen_channels[0] * 2),
-                )
-            )
-        )
+        )(x)
 
         i = 0
         for _ in range(gen_layers // 2):
-            model.add(
-                Conv2DTranspose(
-                    gen_channels[i],
-                    kernel_size=kernel_size,
-                    strides=(1, 1),
-                    padding="same",
-                    use_bias=False,
-                    kernel_initializer=kernel_initializer,
-                    kernel_regularizer=kernel_regularizer,
-                )
-            )
-            model.add(BatchNormalization())
-            model.add(LeakyReLU())
-            i += 1
-
-        model.add(
-            Conv2DTranspose(
+            x = Conv2DTranspose(
                 gen_channels[i],
                 kernel_size=kernel_size,
-                strides=(2, 2),
+                strides=(1, 1),
                 padding="same",
+                data_format="channels_last",
                 use_bias=False,
                 kernel_initializer=kernel_initializer,
                 kernel_regularizer=kernel_regularizer,
-            )
-        )
-        model.add(BatchNormalization())
-        model.add(LeakyReLU())
-
-        for _ in range(gen_layers // 2):
-            model.add(
-                Conv2DTranspose(
-                    gen_channels[i],
-                    kernel_size=kernel_size,
-                    strides=(1, 1),
-                    padding="same",
-                    use_bias=False,
-                    kernel_initializer=kernel_initializer,
-                    kernel_regularizer=kernel_regularizer,
-                )
-            )
-            model.add(BatchNormalization())
-            model.add(LeakyReLU())
+            )(x)
+            x = BatchNormalization(fused=True)(x)
+            x = LeakyReLU()(x)
             i += 1
 
-        model.add(
-            Conv2DTranspose(
-                self.image_size[2],
+        x = Conv2DTranspose(
+            gen_channels[i],
+            kernel_size=kernel_size,
+            strides=(2, 2),
+            padding="same",
+            data_format="channels_last",
+            use_bias=False,
+            kernel_initializer=kernel_initializer,
+            kernel_regularizer=kernel_regularizer,
+        )(x)
+        x = BatchNormalization(fused=True)(x)
+        x = LeakyReLU()(x)
+
+        for _ in range(gen_layers // 2):
+            x = Conv2DTranspose(
+                gen_channels[i],
                 kernel_size=kernel_size,
-                strides=(2, 2),
+                strides=(1, 1),
                 padding="same",
+                data_format="channels_last",
                 use_bias=False,
-                activation="tanh",
-            )
-        )
+                kernel_initializer=kernel_initializer,
+                kernel_regularizer=kernel_regularizer,
+            )(x)
+            x = BatchNormalization(fused=True)(x)
+            x = LeakyReLU()(x)
+            i += 1
 
+        output = Conv2DTranspose(
+            self.image_size[2],
+            kernel_size=kernel_size,
+            strides=(2, 2),
+            padding="same",
+            data_format="channels_last",
+            use_bias=False,
+            activation="tanh",
+            dtype="float32",
+        )(x)
+
+        model = Model(z, output)
         return model
 
     def discriminator(self):
@@ -273,57 +341,81 @@ class DCGAN:
         kernel_regularizer = self.config["kernel_regularizer"]
         kernel_size = self.config["kernel_size"]
 
-        model = tf.keras.Sequential()
+        image = Input(shape=self.image_size)
 
-        model.add(
-            Conv2D(
-                disc_channels[0] // 2,
-                kernel_size=kernel_size,
-                strides=(2, 2),
-                padding="same",
-                kernel_initializer=kernel_initializer,
-                kernel_regularizer=kernel_regularizer,
-                input_shape=self.image_size,
-            )
-        )
-        model.add(LeakyReLU())
-        model.add(Dropout(dropout_rate))
+        x = Conv2D(
+            max(16, disc_channels[0] // 2),
+            kernel_size=kernel_size,
+            strides=(2, 2),
+            padding="same",
+            data_format="channels_last",
+            kernel_initializer=kernel_initializer,
+            kernel_regularizer=kernel_regularizer,
+        )(image)
+        x = LeakyReLU()(x)
+        x = Dropout(dropout_rate)(x)
 
         for i in range(disc_layers):
-            model.add(
-                Conv2D(
-                    disc_channels[i],
-                    kernel_size=kernel_size,
-                    strides=(1, 1),
-                    padding="same",
-                    kernel_initializer=kernel_initializer,
-                    kernel_regularizer=kernel_regularizer,
-                )
-            )
-            model.add(LeakyReLU())
-            model.add(Dropout(dropout_rate))
-
-        model.add(
-            Conv2D(
-                disc_channels[-1] * 2,
+            x = Conv2D(
+                disc_channels[i],
                 kernel_size=kernel_size,
-                strides=(2, 2),
+                strides=(1, 1),
                 padding="same",
+                data_format="channels_last",
                 kernel_initializer=kernel_initializer,
                 kernel_regularizer=kernel_regularizer,
-            )
-        )
-        model.add(LeakyReLU())
-        model.add(Dropout(dropout_rate))
+            )(x)
+            x = LeakyReLU()(x)
+            x = Dropout(dropout_rate)(x)
+
+        x = Conv2D(
+            disc_channels[-1] * 2,
+            kernel_size=kernel_size,
+            strides=(2, 2),
+            padding="same",
+            data_format="channels_last",
+            kernel_initializer=kernel_initializer,
+            kernel_regularizer=kernel_regularizer,
+        )(x)
+        x = LeakyReLU()(x)
+        x = Dropout(dropout_rate)(x)
+
+        x = Flatten()(x)
+        output = Dense(1, dtype="float32")(x)
+
+        model = Model(image, output)
+        return model
 
-        model.add(Flatten())
-        model.add(Dense(1))
+    def _get_strategy(self):
 
-        return model
+        # Replicates the models on every visible GPU and splits each batch between them.
+        # Created on first use so objects that only build the networks skip device setup
+        if self._strategy is None:
+            self._strategy = tf.distribute.MirroredStrategy()
+
+        return self._strategy
+
+    def _num_replicas(self):
+
+        return self._get_strategy().num_replicas_in_sync
 
     def __load_model(self):
 
-        self.gen_model, self.disc_model = self.generator(), self.discriminator()
+        # Convolutions run in float16 on GPUs with Tensor Cores, weights stay float32.
+        # The policy only applies while the networks are built so other models keep theirs
+        policy = tf.keras.mixed_precision.global_policy()
+        if tf.config.list_physical_devices("GPU"):
+            tf.keras.mixed_precision.set_global_policy("mixed_float16")
+
+        try:
+            with self._get_strategy().scope():
+                self.gen_model = self.generator()
+                self.disc_model = self.discriminator()
+                # Stateful noise source reused by every step instead of a fresh
+                # random op per call; created in scope so each replica draws its own stream
+                self._rng = tf.random.Generator.from_non_deterministic_state()
+        finally:
+            tf.keras.mixed_precision.set_global_policy(policy)
 
         if self.config["gen_path"] is not None:
             self.gen_model.load_weights(self.config["gen_path"])
@@ -332,6 +424,182 @@ class DCGAN:
             self.disc_model.load_weights(self.config["disc_path"])
             print("Discriminator checkpoint restored")
 
+    def _train_step(self, data):
+
+        # A single forward pass of the generator is shared by both updates
+        with tf.GradientTape(persistent=True) as tape:
+
+            Z = self._rng.normal([tf.shape(data)[0], self.noise_dim])
+            fake = self.gen_model(Z, training=True)
+            fake_logits = self.disc_model(fake, training=True)
+            real_logits = self.disc_model(data, training=True)
+            D_loss = gan_discriminator_loss(real_logits, fake_logits)
+            G_loss = gan_generator_loss(fake_logits)
+            # Gradients are summed over the replicas, so each replica's loss is scaled
+            replicas = self._strategy.num_replicas_in_sync
+            scaled_D_loss = self._disc_optimizer.get_scaled_loss(D_loss / replicas)
+            scaled_G_loss = self._gen_optimizer.get_scaled_loss(G_loss / replicas)
+
+        scaled_gradients = tape.gradient(
+            scaled_D_loss, self.disc_model.trainable_variables
+        )
+        disc_gradients = self._disc_optimizer.get_unscaled_gradients(scaled_gradients)
+        scaled_gradients = tape.gradient(
+            scaled_G_loss, self.gen_model.trainable_variables
+        )
+        gen_gradients = self._gen_optimizer.get_unscaled_gradients(scaled_gradients)
+        del tape
+
+        self._disc_optimizer.apply_gradients(
+            zip(disc_gradients, self.disc_model.trainable_variables)
+        )
+        self._gen_optimizer.apply_gradients(
+            zip(gen_gradients, self.gen_model.trainable_variables)
+        )
+
+        return D_loss, G_loss
+
+    def _disc_step(self, data):
+
+        with tf.GradientTape() as tape:
+
+            Z = self._rng.normal([tf.shape(data)[0], self.noise_dim])
+            fake = self.gen_model(Z, training=True)
+            fake_logits = self.disc_model(fake, training=True)
+            real_logits = self.disc_model(data, training=True)
+            D_loss = gan_discriminator_loss(real_logits, fake_logits)
+            replicas = self._strategy.num_replicas_in_sync
+            scaled_D_loss = self._disc_optimizer.get_scaled_loss(D_loss / replicas)
+
+        scaled_gradients = tape.gradient(
+            scaled_D_loss, self.disc_model.trainable_variables
+        )
+        gradients = self._disc_optimizer.get_unscaled_gradients(scaled_gradients)
+        self._disc_optimizer.apply_gradients(
+            zip(gradients, self.disc_model.trainable_variables)
+        )
+
+        return D_loss
+
+    def _gen_step(self, batch_size):
+
+        # The generator loss only depends on the fake logits, so no discriminator
+        # pass over the real batch is made here
+        with tf.GradientTape() as tape:
+
+            Z = self._rng.normal([batch_size, self.noise_dim])
+            fake = self.gen_model(Z, training=True)
+            fake_logits = self.disc_model(fake, training=True)
+            G_loss = gan_generator_loss(fake_logits)
+            replicas = self._strategy.num_replicas_in_sync
+            scaled_G_loss = self._gen_optimizer.get_scaled_loss(G_loss / replicas)
+
+        scaled_gradients = tape.gradient(
+            scaled_G_loss, self.gen_model.trainable_variables
+        )
+        gradients = self._gen_optimizer.get_unscaled_gradients(scaled_gradients)
+        self._gen_optimizer.apply_gradients(
+            zip(gradients, self.gen_model.trainable_variables)
+        )
+
+        return G_loss
+
+    def _alternating_train_step(self, data):
+
+        # Python loops are unrolled when traced, each update sees the other
+        # network's latest weights
+        for _ in range(self._n_disc_steps):
+            D_loss = self._disc_step(data)
+        for _ in range(self._n_gen_steps):
+            G_loss = self._gen_step(tf.shape(data)[0])
+
+        return D_loss, G_loss
+
+    def _distributed_train_step(self, data):
+
+        # The fused step shares one generator pass between both updates, which is
+        # only possible when each network is updated once per batch
+        if self._n_disc_steps == 1 and self._n_gen_steps == 1:
+            step_fn = self._train_step
+        else:
+            step_fn = self._alternating_train_step
+
+        D_loss, G_loss = self._strategy.run(step_fn, args=(data,))
+        D_loss = self._strategy.reduce(tf.distribute.ReduceOp.MEAN, D_loss, axis=None)
+        G_loss = self._strategy.reduce(tf.distribute.ReduceOp.MEAN, G_loss, axis=None)
+
+        return D_loss, G_loss
+
+    def _build_optimizer(self, name, learning_rate, beta_1, variables):
+
+        # Legacy optimizers run faster in graph mode. Their slots are created
+        # up front so the first training step does not stall on allocations
+        optimizers = tf.keras.optimizers
+        if hasattr(optimizers, "legacy") and hasattr(optimizers.legacy, name):
+            optimizers = optimizers.legacy
+
+        kwargs = {}
+        kwargs["learning_rate"] = learning_rate
+        if name == "Adam":
+            kwargs["beta_1"] = beta_1
+        optimizer = getattr(optimizers, name)(**kwargs)
+
+        if hasattr(optimizer, "_create_all_weights"):
+            optimizer._create_all_weights(variables)
+        else:
+            optimizer.build(variables)
+
+        return tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+
+    def _summarize_step(self, train_step, summary_writer, element_spec):
+
+        # Summary ops cannot be compiled with XLA, so the losses are written from a
+        # graph wrapping the step instead of eagerly after every call. The batch
+        # counter is kept apart from the optimizer iterations, which skip
+        # non-finite loss scaled steps and advance n_gen_steps times per batch
+        step = tf.Variable(0, dtype=tf.int64, trainable=False)
+
+        @tf.function(input_signature=[element_spec])
+        def summarized_step(data):
+            D_loss, G_loss = train_step(data)
+            step.assign_add(1)
+            with summary_writer.as_default(step=step):
+                tf.summary.scalar("discr_loss", D_loss)
+                tf.summary.scalar("genr_loss", G_loss)
+            return D_loss, G_loss
+
+        return summarized_step
+
+    def _repeat_dataset(self, train_ds):
+
+        # Datasets from load_data already repeat, finite ones passed in directly
+        # are repeated here so the iterator outlives a single epoch. Finite ones
+        # of unknown length (e.g. after filter) are left as is, no step count is
+        # returned and they are iterated once per epoch instead
+        steps_per_epoch = tf.data.experimental.cardinality(train_ds).numpy()
+        if steps_per_epoch == tf.data.experimental.INFINITE_CARDINALITY:
+            assert (
+                self._steps_per_epoch is not None
+            ), "Repeating datasets must come from load_data, pass a finite dataset instead"
+            return train_ds, self._steps_per_epoch
+        if steps_per_epoch == tf.data.experimental.UNKNOWN_CARDINALITY:
+            return train_ds, None
+        assert steps_per_epoch > 0, "Training dataset has no batches"
+
+        return train_ds.repeat(), steps_per_epoch
+
+    def _epoch_batches(self, train_ds, steps_per_epoch):
+
+        # Yields the batches of every epoch, a single iterator is shared across
+        # epochs unless the number of steps per epoch is unknown
+        if steps_per_epoch is None:
+            while True:
+                yield train_ds
+
+        iterator = iter(train_ds)
+        while True:
+            yield itertools.islice(iterator, steps_per_epoch)
+
     def fit(
         self,
         train_ds=None,
@@ -344,6 +612,9 @@ class DCGAN:
         beta_1=0.5,
         tensorboard=False,
         save_model=None,
+        use_xla=True,
+        n_disc_steps=1,
+        n_gen_steps=1,
     ):
 
         r"""Function to train the model
@@ -360,87 +631,94 @@ class DCGAN:
             tensorboard (bool, optional): if true, writes loss values to ``logs/gradient_tape`` directory
                 which aids visualization. Defaults to ``False``
             save_model (str, optional): Directory to save the trained model. Defaults to ``None``
+            use_xla (bool, optional): if true, compiles the training step with XLA when training on a single device. Defaults to ``True``
+            n_disc_steps (int, optional): number of discriminator updates per batch, the logged D_loss is the one of the final update. Defaults to ``1``
+            n_gen_steps (int, optional): number of generator updates per batch, the logged G_loss is the one of the final update. Defaults to ``1``
         """
 
         assert (
             train_ds is not None
         ), "Initialize training data through train_ds parameter"
+        assert (
+            n_disc_steps >= 1 and n_gen_steps >= 1
+        ), "n_disc_steps and n_gen_steps must be at least 1"
 
-        self.__load_model()
+        self._n_disc_steps = n_disc_steps
+        self._n_gen_steps = n_gen_steps
 
-        kwargs = {}
-        kwargs["learning_rate"] = gen_learning_rate
-        if gen_optimizer == "Adam":
-            kwargs["beta_1"] = beta_1
-        gen_optimizer = getattr(tf.keras.optimizers, gen_optimizer)(**kwargs)
+        # Models and optimizers are kept across fit calls so training resumes
+        # from their current state, they are rebuilt for a new image size
+        if self.gen_model is None or self.gen_model.output_shape[1:] != tuple(
+            self.image_size
+        ):
+            self.__load_model()
+            self._gen_optimizer_config = None
+            self._disc_optimizer_config = None
+        self._folded_gen_model = None
 
-        kwargs = {}
-        kwargs["learning_rate"] = disc_learning_rate
-        if disc_optimizer == "Adam":
-            kwargs["beta_1"] = beta_1
-        disc_optimizer = getattr(tf.keras.optimizers, disc_optimizer)(**kwargs)
+        with self._get_strategy().scope():
+
+            config = (gen_optimizer, gen_learning_rate, beta_1)
+            if config != self._gen_optimizer_config:
+                self._gen_optimizer = self._build_optimizer(
+                    *config, self.gen_model.trainable_variables
+                )
+                self._gen_optimizer_config = config
+
+            config = (disc_optimizer, disc_learning_rate, beta_1)
+            if config != self._disc_optimizer_config:
+                self._disc_optimizer = self._build_optimizer(
+                    *config, self.disc_model.trainable_variables
+                )
+                self._disc_optimizer_config = config
+
+        train_ds, steps_per_epoch = self._repeat_dataset(train_ds)
+        dist_train_ds = self._strategy.experimental_distribute_dataset(train_ds)
+
+        # The step is traced per fit call so it picks up the models and optimizers
+        # created above, the fixed input signature keeps it to a single trace.
+        # XLA cannot compile a step that spans several replicas.
+        train_step = tf.function(
+            self._distributed_train_step,
+            jit_compile=use_xla and self._strategy.num_replicas_in_sync == 1,
+            input_signature=[dist_train_ds.element_spec],
+        )
 
         if tensorboard:
             current_time = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
             train_log_dir = "logs/gradient_tape/" + current_time + "/train"
             train_summary_writer = tf.summary.create_file_writer(train_log_dir)
+            train_step = self._summarize_step(
+                train_step, train_summary_writer, dist_train_ds.element_spec
+            )
 
         steps = 0
         generator_loss = tf.keras.metrics.Mean()
         discriminator_loss = tf.keras.metrics.Mean()
 
-        try:
-            total = tf.data.experimental.cardinality(train_ds).numpy()
-        except:
-            total = 0
+        epoch_batches = self._epoch_batches(dist_train_ds, steps_per_epoch)
 
         for epoch in range(epochs):
 
             generator_loss.reset_states()
             discriminator_loss.reset_states()
 
-            pbar = tqdm(total=total, desc="Epoch - " + str(epoch + 1))
-            for data in train_ds:
-
-                with tf.GradientTape() as tape:
-
-                    Z = tf.random.normal([data.shape[0], self.noise_dim])
-                    fake = self.gen_model(Z)
-                    fake_logits = self.disc_model(fake)
-                    real_logits = self.disc_model(data)
-                    D_loss = gan_discriminator_loss(real_logits, fake_logits)
-
-                gradients = tape.gradient(D_loss, self.disc_model.trainable_variables)
-                disc_optimizer.apply_gradients(
-                    zip(gradients, self.disc_model.trainable_variables)
-                )
-
-                with tf.GradientTape() as tape:
+            pbar = tqdm(total=steps_per_epoch, desc="Epoch - " + str(epoch + 1))
+            for data in next(epoch_batches):
 
-                    Z = tf.random.normal([data.shape[0], self.noise_dim])
-                    fake = self.gen_model(Z)
-                    fake_logits = self.disc_model(fake)
-                    G_loss = gan_generator_loss(fake_logits)
-
-                gradients = tape.gradient(G_loss, self.gen_model.trainable_variables)
-                gen_optimizer.apply_gradients(
-                    zip(gradients, self.gen_model.trainable_variables)
-                )
+                D_loss, G_loss = train_step(data)
 
                 generator_loss(G_loss)
                 discriminator_loss(D_loss)
 
                 steps += 1
                 pbar.update(1)
-                pbar.set_postfix(
-                    disc_loss=discriminator_loss.result().numpy(),
-                    gen_loss=generator_loss.result().numpy(),
-                )
-
-                if tensorboard:
-                    with train_summary_writer.as_default():
-                        tf.summary.scalar("discr_loss", D_loss.numpy(), step=steps)
-                        tf.summary.scalar("genr_loss", G_loss.numpy(), step=steps)
+                # Reading the metrics blocks on the device, so only refresh the bar periodically
+                if steps % 50 == 0:
+                    pbar.set_postfix(
+                        disc_loss=discriminator_loss.result().numpy(),
+                        gen_loss=generator_loss.result().numpy(),
+                    )
 
             pbar.close()
             del pbar
@@ -450,9 +728,9 @@ class DCGAN:
                     "Epoch:",
                     epoch + 1,
                     "D_loss:",
-                    generator_loss.result().numpy(),
-                    "G_loss",
                     discriminator_loss.result().numpy(),
+                    "G_loss",
+                    generator_loss.result().numpy(),
                 )
 
         if save_model is not None:
@@ -480,12 +758,17 @@ class DCGAN:
         if self.gen_model is None:
             self.__load_model()
 
+        # Generators that are not a single chain of layers are sampled unfolded
+        if self._folded_gen_model is None and _is_single_path(self.gen_model):
+            self._folded_gen_model = _fold_batch_norm(self.gen_model)
+        elif self._folded_gen_model is None:
+            self._folded_gen_model = self.gen_model
+
         Z = tf.random.normal([n_samples, self.noise_dim])
-        generated_samples = self.gen_model(Z).numpy()
+        generated_samples = self._folded_gen_model(Z, training=False).numpy()
 
         if save_dir is None:
             return generated_samples
 
         assert os.path.exists(save_dir), "Directory does not exist"
-        for i, sample in enumerate(generated_samples):
-            imageio.imwrite(os.path.join(save_dir, "sample_" + str(i) + ".jpg"), sample)
+        save_images(generated_samples, save_dir, value_range=(-1.0, 1.0))
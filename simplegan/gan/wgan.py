@@ -78,6 +78,11 @@ class WGAN(DCGAN):
             disc_path,
         )
 
+    def _num_replicas(self):
+
+        # WGAN trains on a single device, so load_data keeps the batch size as given
+        return 1
+
     def __load_model(self):
 
         self.gen_model, self.disc_model = self.generator(), self.discriminator()
@@ -124,6 +129,7 @@ class WGAN(DCGAN):
         ), "Initialize training data through train_ds parameter"
 
         self.__load_model()
+        self._folded_gen_model = None
 
         kwargs = {}
         kwargs["learning_rate"] = gen_learning_rate
@@ -146,18 +152,16 @@ class WGAN(DCGAN):
         generator_loss = tf.keras.metrics.Mean()
         discriminator_loss = tf.keras.metrics.Mean()
 
-        try:
-            total = tf.data.experimental.cardinality(train_ds).numpy()
-        except:
-            total = 0
+        train_ds, steps_per_epoch = self._repeat_dataset(train_ds)
+        epoch_batches = self._epoch_batches(train_ds, steps_per_epoch)
 
         for epoch in range(epochs):
 
             generator_loss.reset_states()
             discriminator_loss.reset_states()
 
-            pbar = tqdm(total=total, desc="Epoch - " + str(epoch + 1))
-            for data in train_ds:
+            pbar = tqdm(total=steps_per_epoch, desc="Epoch - " + str(epoch + 1))
+            for data in next(epoch_batches):
 
                 for _ in range(5):
 
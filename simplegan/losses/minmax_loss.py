@@ -3,7 +3,10 @@ import tensorflow as tf
 
 __all__ = ["gan_discriminator_loss", "gan_generator_loss"]
 
-cross_entropy = tf.keras.losses.BinaryCrossentropy(from_logits=True)
+# Losses are averaged explicitly so they can also be computed per replica under tf.distribute
+cross_entropy = tf.keras.losses.BinaryCrossentropy(
+    from_logits=True, reduction=tf.keras.losses.Reduction.NONE
+)
 
 
 def gan_discriminator_loss(real_output, fake_output):
@@ -17,8 +20,8 @@ def gan_discriminator_loss(real_output, fake_output):
         a tensor representing the sum of real and fake loss
     """
 
-    real_loss = cross_entropy(tf.ones_like(real_output), real_output)
-    fake_loss = cross_entropy(tf.zeros_like(fake_output), fake_output)
+    real_loss = tf.math.reduce_mean(cross_entropy(tf.ones_like(real_output), real_output))
+    fake_loss = tf.math.reduce_mean(cross_entropy(tf.zeros_like(fake_output), fake_output))
     return real_loss + fake_loss
 
 
@@ -32,4 +35,4 @@ def gan_generator_loss(fake_output):
         a tensor representing the generator loss
     """
 
-    return cross_entropy(tf.ones_like(fake_output), fake_output)
+    return tf.math.reduce_mean(cross_entropy(tf.ones_like(fake_output), fake_output))
@@ -0,0 +1 @@
+from .save_images import *
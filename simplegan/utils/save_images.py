@@ -0,0 +1,34 @@
+import os
+import tensorflow as tf
+
+__all__ = ["save_images"]
+
+
+def save_images(images, save_dir, value_range=(0.0, 1.0)):
+
+    r"""
+    Args:
+        images (tensor, numpy array): A batch of images with shape (n_samples, height, width, channels)
+        save_dir (str): directory to save the images to as ``sample_<i>.jpg``
+        value_range (tuple, optional): range of the pixel values of the images. Defaults to ``(0.0, 1.0)``
+    """
+
+    # Images are rescaled to uint8 once, then JPEG encoded and written in parallel
+    # by a tf.data pipeline
+    low, high = value_range
+    images = (tf.cast(images, tf.float32) - low) * (255.0 / (high - low))
+    images = tf.cast(tf.clip_by_value(tf.round(images), 0, 255), tf.uint8)
+    prefix = os.path.join(save_dir, "sample_")
+
+    def write_image(i, image):
+        filename = tf.strings.join([prefix, tf.strings.as_string(i), ".jpg"])
+        tf.io.write_file(filename, tf.io.encode_jpeg(image))
+        return i
+
+    ds = (
+        tf.data.Dataset.from_tensor_slices(images)
+        .enumerate()
+        .map(write_image, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+    )
+    for _ in ds:
+        pass